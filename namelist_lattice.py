@@ -9,6 +9,12 @@ from os.path import expanduser
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 import warnings
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 mpl.rcParams['axes.xmargin'] = 0.1
 mpl.rcParams['axes.ymargin'] = 0.1
@@ -21,6 +27,183 @@ ENDC  = '\033[0m'
 # ==========================================================================================
 
 
+def _cartesian_fill(vec, stride, out):
+    '''
+    Fills one dimension of the Cartesian product of M vectors, writing the values of that
+    dimension at every lattice point directly into a pre-allocated row, without 
+    materializing any intermediate grids or index arrays. Compiled with numba if it is 
+    installed, for numeric dtypes; otherwise, _cartesian_fill_numpy is used instead
+
+    Parameters
+    ----------
+    vec : (K,) array
+        The values of this dimension
+    stride : int
+        The number of consecutive lattice points over which the value of this dimension
+        is held constant
+    out : (T,) array
+        Output row; on return, out[idx] is the value of this dimension at the idx-th 
+        lattice point
+    '''
+    K = vec.shape[0]
+    pos = 0
+    for outer in range(out.shape[0] // (K * stride)):
+        for k in range(K):
+            v = vec[k]
+            for s in range(stride):
+                out[pos] = v
+                pos += 1
+
+
+def _cartesian_fill_numpy(vec, stride, out):
+    '''
+    Equivalent of _cartesian_fill, done with a single broadcast assignment in numpy, for 
+    use when numba is not installed or the dtype is not numeric. See _cartesian_fill for 
+    parameter descriptions.
+    '''
+    out.reshape(-1, vec.shape[0], stride)[...] = vec[None, :, None]
+
+
+if(njit is not None):
+    _cartesian_fill_numba = njit(cache=True)(_cartesian_fill)
+else:
+    _cartesian_fill_numba = None
+
+
+# ==========================================================================================
+# ==========================================================================================
+
+
+def _make_one_clone(new_case, values, root_case, cime_dir, top_output_dir, stdoutf, resubmits, 
+                    nl_file, params, nl_single_js, xml_single_js, nl_group_js, xml_group_js, 
+                    all_params):
+    '''
+    Clones the root case to a single lattice point, and edits the namelist file of the clone 
+    with the content of that point. This is the per-clone work of 
+    namelist_lattice.create_clones(), and may be run concurrently for many clones from 
+    worker threads.
+
+    Parameters
+    ----------
+    new_case : string
+        Location of the clone to be created
+    values : tuple
+        Parameter values at this lattice point, ordered as params
+    root_case, cime_dir, top_output_dir, resubmits : 
+        See namelist_lattice.create_clones()
+    stdoutf : file object
+        Open file to which to send stdout for calls to CIME utilities. If None, all output 
+        is sent to the terminal.
+    nl_file : string
+        Name of the namelist file to be edited within the clone, i.e. user_nl_{component}
+    params : (M,) string list
+        Names of the parameters on the lattice
+    nl_single_js, xml_single_js, nl_group_js, xml_group_js : int list
+        Indices into params of the single parameters and parameter groups which are to be 
+        set in user_nl_{component}, and by xmlchange, respectively
+    all_params : string frozenset
+        Names of all parameters on the lattice, expanding parameter groups
+
+    Returns
+    -------
+    new_case : string
+        Location of the created clone
+    '''
+    
+    # call the cloning script
+    if(top_output_dir is not None):
+        cmd = '{}/create_clone --case {} --clone {} --cime-output-root {} --keepexe'.format(
+               cime_dir, new_case, root_case, top_output_dir)
+    else:
+        cmd = '{}/create_clone --case {} --clone {} --keepexe'.format(
+               cime_dir, new_case, root_case)
+    # pipe output to file if specified
+    subprocess.run(cmd.split(' '), stdout=stdoutf)
+
+    # settings to be made in env_run.xml via xmlchange, starting with clone resubmissions
+    print('Setting RESUBMIT={}'.format(resubmits))
+    xml_settings = [('RESUBMIT', resubmits)]
+    
+    # --- edit the user_nl_{component} file ---
+    
+    nl_path = '{}/{}'.format(new_case, nl_file)
+    with open(nl_path) as f:
+        entries = f.readlines()
+    
+    # purge current occurences of the parameters present in the lattice
+    lines = [e for e in entries if e.split('=', 1)[0].strip() not in all_params]
+    if(len(lines) > 0 and not lines[-1].endswith('\n')):
+        lines[-1] += '\n'
+    
+    # add new parameter choices
+    lines.append('! Following entries written by CESM_namelist_automator\n')
+    
+    # write single parameter choices to user_nl_{component}
+    for j in nl_single_js:
+        lines.append('{} = {}\n'.format(params[j], values[j]))
+    
+    # write all parameter choices in each group to user_nl_{component}
+    for j in nl_group_js:
+        for group_param, group_value in zip(params[j].split(','), values[j].split(',')):
+            lines.append('{} = {}\n'.format(group_param, group_value))
+    
+    # queue single parameter choices, and all parameter choices in each group, for xmlchange
+    for j in xml_single_js:
+        xml_settings.append((params[j], values[j]))
+    for j in xml_group_js:
+        xml_settings.extend(zip(params[j].split(','), values[j].split(',')))
+    
+    with open(nl_path, 'w') as f:
+        f.writelines(lines)
+
+    # --- write all queued settings to env_run.xml with a single call to xmlchange ---
+    xmlcmd = ['{}/xmlchange'.format(new_case), 
+              ','.join(['{}={}'.format(k, v) for k, v in xml_settings])]
+    subprocess.run(xmlcmd, stdout=stdoutf, cwd=new_case)
+
+    return new_case
+
+
+def _query_resubmits(clone):
+    '''
+    Queries the number of remaining resubmissions of a case
+
+    Parameters
+    ----------
+    clone : string
+        Location of the case
+
+    Returns
+    -------
+    clone : string
+        Location of the case
+    resubs : int
+        Current value of RESUBMIT for the case
+    '''
+    resub_query = ['{}/xmlquery'.format(clone), 'RESUBMIT']
+    resubs = subprocess.check_output(resub_query, cwd=clone)
+    return clone, int(resubs.split()[-1])
+
+
+def _submit_case(clone, stdoutf):
+    '''
+    Submits a run of a case
+
+    Parameters
+    ----------
+    clone : string
+        Location of the case
+    stdoutf : file object
+        Open file to which to send stdout of the submission. If None, all output is sent 
+        to the terminal.
+    '''
+    subprocess.run('{}/case.submit'.format(clone), stdout=stdoutf, cwd=clone)
+
+
+# ==========================================================================================
+# ==========================================================================================
+
+
 class namelist_lattice:
     def __init__(self, component='eam', nofill=False):
         '''
@@ -50,7 +233,16 @@ class namelist_lattice:
         self.paramgroup_mask = []
         self.paramgroup_labels = []
         self.clone_dirs = []
+        self._all_group_params = []
+        self._param_names_arr = np.array([], dtype=str)
+        self._xml_mask_arr = np.array([], dtype=bool)
+        self._pg_mask_arr = np.array([], dtype=bool)
+        self._group_idx = np.array([], dtype=int)
+        self._single_idx = np.array([], dtype=int)
         self._lattice = None
+        self._lattice_names = []
+        self._lattice_T = 0
+        self._built_dim_count = 0
     
     @property
     def lattice(self):
@@ -128,16 +320,13 @@ class namelist_lattice:
                 # remove whitespace
                 name = ''.join(name.split())
                 names[i] = name
-                values[i] = ''.join(values[i].split())
                 
                 assert group_labels[i] is not None, 'group_label must be passed if group is True'
                 assert group_labels[i] not in self.paramgroup_labels, \
                        'group_label with name {} already exists in the lattice'.format(group_labels[i])
                 
-                all_groupparams = np.ravel([s.split(',') for s in 
-                                  np.array(self.param_names)[np.where(self.paramgroup_mask)]]).tolist()
                 for groupparam in name.split(','):
-                    assert groupparam not in all_groupparams, \
+                    assert groupparam not in self._all_group_params, \
                            'parameter with name {} aleady exists in the lattice'.format(groupparam)
 
                 assert len(np.unique(name.split(','))) == len(name.split(',')), \
@@ -164,7 +353,7 @@ class namelist_lattice:
             self.param_names.extend(names)
             for i in range(len(names)):
                 if(logspace):
-                    vals = np.linspace(np.log10(limits[i][0]), np.log10(limits[i][1]), nsamples[i])
+                    vals = np.geomspace(limits[i][0], limits[i][1], nsamples[i])
                 else:
                     vals = np.linspace(limits[i][0], limits[i][1], nsamples[i])
                 self.param_vectors.append(vals)
@@ -173,12 +362,19 @@ class namelist_lattice:
             assert limits is None and nsamples is None, call_err
             
             # ----- values explicitly defined by user
-            values = np.atleast_2d(values)
+            # keep as a list of 1D arrays, one per dimension, which may differ in length
+            if(not isinstance(values, (list, tuple, np.ndarray))):
+                values = [values]
+            if(not isinstance(values[0], (list, tuple, np.ndarray))):
+                values = [values]
+            values = [np.asarray(v) for v in values]
             
             assert len(names) == len(values),\
                    'args \'names\'  and \'values\' must be of equal length'
             
             if(group):
+                # remove whitespace
+                values = [np.array([''.join(v.split()) for v in vals]) for vals in values]
                 for i in range(len(names)):
                     for j in range(len(values[i])):
                         assert len(names[i].split(',')) == len(values[i][j].split(',')), \
@@ -190,13 +386,14 @@ class namelist_lattice:
             str_warn = WARNC+'\n\n------ value {} is of type string, but no quotation characters '\
                        '(\",\') are included around the string. This may cause Fortran error on case '\
                        'creation if not intended.'+ENDC
-            all_vals = values.flatten()
-            for i in range(len(all_vals)):
-                if(all_vals[i].dtype.char in ['U', 'S']):
-                    if(all_vals[i][0] not in quote_chars or 
-                       all_vals[i][-1] not in quote_chars or
-                       all_vals[i][0] != all_vals[i][-1]):
-                        warnings.warn(str_warn.format(all_vals[i]))
+            for vals in values:
+                if(vals.dtype.kind in ('U', 'S')):
+                    vals = vals.astype(str)
+                    quoted = np.zeros(len(vals), dtype=bool)
+                    for q in quote_chars:
+                        quoted |= np.char.startswith(vals, q) & np.char.endswith(vals, q)
+                    for i in np.flatnonzero(~quoted):
+                        warnings.warn(str_warn.format(vals[i]))
 
             # ----- build new dimensions
             self.param_names.extend(names)
@@ -212,9 +409,19 @@ class namelist_lattice:
         if(group):
             self.paramgroup_mask.extend([1]*len(names))
             self.paramgroup_labels.extend(group_labels)
+            # update the flattened list of all parameters belonging to groups
+            self._all_group_params = [p for name, m in zip(self.param_names, self.paramgroup_mask)
+                                      if m for p in name.split(',')]
         else:
             self.paramgroup_mask.extend([0]*len(names))
         
+        # cache array forms of the parameter names and flags
+        self._param_names_arr = np.asarray(self.param_names)
+        self._xml_mask_arr = np.asarray(self.xml_mask, dtype=bool)
+        self._pg_mask_arr = np.asarray(self.paramgroup_mask, dtype=bool)
+        self._group_idx = np.where(self._pg_mask_arr)[0]
+        self._single_idx = np.where(~self._pg_mask_arr)[0]
+        
         # build the lattice
         self._build_lattice()
     
@@ -231,8 +438,18 @@ class namelist_lattice:
         mask : bool array with length matching the number of lattice points
         '''
         
-        mask = np.array(mask, dtype=bool)
-        self._lattice = self._lattice[mask]
+        mask = np.asarray(mask, dtype=bool)
+        if(mask.shape != (self._lattice_T,)):
+            raise RuntimeError('mask of shape {} does not match the number of lattice points ({})'\
+                               .format(mask.shape, self._lattice_T))
+        
+        # gather every column through the same integer indices of the retained points
+        idx = np.flatnonzero(mask)
+        self._lattice = {k: v[idx] for k,v in self._lattice.items()}
+        self._lattice_T = idx.size
+        
+        # the filtered lattice can no longer be extended; rebuild on the next expand()
+        self._built_dim_count = 0
 
 
     # ------------------------------------------------------------------------------
@@ -240,29 +457,95 @@ class namelist_lattice:
 
     def _build_lattice(self):
         '''
-        Builds the lattice and returns it as a set of M-dimensional points, where M is 
-        the total number of dimensions added with expand()
+        Builds the lattice as a set of T M-dimensional points, where M is the total number 
+        of dimensions added with expand(). The lattice is stored column-wise, as a dict 
+        mapping each of the M parameter names to a (T,) array of its values at each point.
 
-        Returns
-        -------
-        lattice : (T, M) float array
-            a array of T total M-dimensional points on the lattice
+        If filling, and the lattice has already been built for some leading subset of the
+        current dimensions (and not since filtered), the existing lattice is extended by
+        only the newly added dimensions, rather than being rebuilt from scratch.
         '''
         
+        M = len(self.param_vectors)
+        dtype = np.concatenate(self.param_vectors).dtype
         if(not self.nofill):
-            grid = np.meshgrid(*self.param_vectors)
-            points = np.vstack(list(map(np.ravel, grid)))
-            self._lattice = np.core.records.fromarrays(points, names=self.param_names)
+            # the new dimensions may require a wider common dtype than the existing lattice,
+            # in which case it must be rebuilt from the original parameter vectors
+            extend = self._lattice is not None and self._built_dim_count > 0 and \
+                     self._lattice[self._lattice_names[0]].dtype == dtype
+        
+        if(self.nofill):
+            # each dimension is used directly as a column, only copied if it must be promoted 
+            # to the common dtype
+            T = len(self.param_vectors[0])
+            assert all([len(v) == T for v in self.param_vectors]), \
+                   'all dimensions must have an equal number of values if nofill=True'
+            self._lattice = {name: np.asarray(v, dtype=dtype) 
+                             for name, v in zip(self.param_names, self.param_vectors)}
+            self._lattice_T = T
+        
+        elif(not extend):
+            # the point ordering matches np.meshgrid's default 'xy' indexing, in which the
+            # dimensions vary from slowest to fastest in the order (1, 0, 2, ..., M-1)
+            shapes = [len(v) for v in self.param_vectors]
+            order = [1, 0] + list(range(2, M)) if M > 1 else [0]
+            T = 1
+            strides = [0] * M
+            for d in order[::-1]:
+                strides[d] = T
+                T *= shapes[d]
+
+            # fill each dimension directly into its row of the lattice, promoting to a common 
+            # dtype, so that no scratch beyond the lattice itself is needed
+            if(_cartesian_fill_numba is not None and dtype.kind in 'biuf'):
+                fill = _cartesian_fill_numba
+            else:
+                fill = _cartesian_fill_numpy
+            points = np.empty((M, T), dtype=dtype)
+            for d in range(M):
+                fill(np.asarray(self.param_vectors[d], dtype=dtype), strides[d], points[d])
+            self._lattice = {name: points[i] for i, name in enumerate(self.param_names)}
+            self._lattice_T = T
+        
         else:
-            points = np.vstack(self.param_vectors)
-            self._lattice = np.core.records.fromarrays(points, names=self.param_names)
+            # fold in each new dimension; consistent with the ordering of the full build, 
+            # the first dimension varies faster than the second, and each dimension 
+            # thereafter varies faster than all preceding ones
+            T = self._lattice_T
+            for d in range(self._built_dim_count, M):
+                v = np.asarray(self.param_vectors[d], dtype=dtype)
+                K = len(v)
+                if(d == 1):
+                    for name in self._lattice:
+                        self._lattice[name] = np.tile(self._lattice[name], K)
+                    self._lattice[self.param_names[d]] = np.repeat(v, T)
+                else:
+                    for name in self._lattice:
+                        self._lattice[name] = np.repeat(self._lattice[name], K)
+                    self._lattice[self.param_names[d]] = np.tile(v, T)
+                T *= K
+            self._lattice_T = T
+            
+        self._lattice_names = list(self.param_names)
+        self._built_dim_count = M
+
+
+    # ------------------------------------------------------------------------------
+
+
+    def _row(self, i):
+        '''
+        Returns the i-th point on the lattice as a tuple of parameter values, ordered 
+        as self.param_names
+        '''
+        return tuple(self._lattice[n][i] for n in self._lattice_names)
 
     # ------------------------------------------------------------------------------
 
 
     def create_clones(self, root_case, top_clone_dir=None, top_output_dir=None, cime_dir=None,  
                       clone_prefix=None, clone_sfx=None, overwrite=False, clean_all=False, 
-                      stdout=None, resubmits=0, read_existing_clones=False):
+                      stdout=None, resubmits=0, read_existing_clones=False, n_workers=None):
         '''
         clone the root_case CESM CIME case per each point on the lattice, and edit the
         namelist file at cloned_case/user_nl_{self.component} with the content of that 
@@ -315,6 +598,9 @@ class namelist_lattice:
             been created, and do not need to be made again (e.g. resubmit_hung_clone_runs). 
             Defaults to False.
             If True, then overwrite and clean_all must both be False. This is enforced.
+        n_workers : int, optional
+            Number of threads with which to create clones concurrently. Defaults to None, in
+            which case the smaller of the number of lattice points and the number of CPUs is used.
         '''
 
         if(self._lattice is None):
@@ -330,23 +616,32 @@ class namelist_lattice:
         if(stdout is not None):
             try: os.remove(stdout)
             except FileNotFoundError: pass
-            self.stdoutf = open(stdout, 'w+')
+            self.stdoutf = open(stdout, 'a+')
             self.stdout = stdout
         else:
             self.stdout = None
             self.stdoutf = None
         
-        params = self._lattice.dtype.names
+        params = self._lattice_names
 
         # build list of parameter names which abbreviates each parameter group with 
         # its assocaited label
-        print_params = np.array(params)
-        print_params[np.where(self.paramgroup_mask)] = self.paramgroup_labels
-
-        # build list of all parameter names, expanding parameter groups
-        all_params = np.hstack([np.array(params)[np.where(1-np.array(self.paramgroup_mask))], 
-                                np.ravel([s.split(',') for s in 
-                                np.array(self.param_names)[np.where(self.paramgroup_mask)]])]) 
+        print_params = self._param_names_arr.copy()
+        print_params[self._group_idx] = self.paramgroup_labels
+
+        # indices of the parameters to be set in the namelist file and by xmlchange, separately
+        # for single parameters and parameter groups
+        xml_mask = self._xml_mask_arr
+        nl_single_js = self._single_idx[~xml_mask[self._single_idx]].tolist()
+        xml_single_js = self._single_idx[xml_mask[self._single_idx]].tolist()
+        nl_group_js = self._group_idx[~xml_mask[self._group_idx]].tolist()
+        xml_group_js = self._group_idx[xml_mask[self._group_idx]].tolist()
+
+        # the namelist file to edit in each clone, and the set of all parameter names which 
+        # will be purged from it, expanding parameter groups
+        nl_file = 'user_nl_{}'.format(self.component)
+        all_params = frozenset(self._param_names_arr[self._single_idx].tolist() + 
+                               self._all_group_params)
         
         # enforce defaults
         if(top_clone_dir is None):
@@ -367,47 +662,89 @@ class namelist_lattice:
             else:
                 print('Nothing to clean')
             
-        # create directories if not exist 
-        if(not os.path.isdir(top_clone_dir)):
-            print('creating {}'.format(top_clone_dir))
-            Path(top_clone_dir).mkdir(parents=True)
-        if(top_output_dir is not None):
-            if(not os.path.isdir(top_output_dir)):
-                print('creating {}'.format(top_output_dir))
-                Path(top_output_dir).mkdir(parents=True) 
+        # create directories if not exist, and list the cases and outputs already present in 
+        # them, to check for conflicts without a stat per clone
+        existing_cases, existing_outs = set(), set()
+        for top_dir, existing in [(top_clone_dir, existing_cases), (top_output_dir, existing_outs)]:
+            if(top_dir is None): 
+                continue
+            try:
+                Path(top_dir).mkdir(parents=True)
+                print('creating {}'.format(top_dir))
+            except FileExistsError:
+                existing.update([e.name for e in os.scandir(top_dir) if e.is_dir()])
+        
+        def dir_exists(path, top_dir, existing):
+            # paths directly under top_dir are checked against its listing, while deeper paths
+            # (e.g. from suffixes containing '/') are checked on disk
+            rel = os.path.relpath(path, top_dir)
+            return rel in existing if os.sep not in rel else os.path.isdir(path)
+        
+        # paths of the cases and outputs queued so far, to catch duplicate clones in this call
+        queued_cases, queued_outs = set(), set()
              
-        print('\n\n =============== CREATING {} CLONES ===============\n'.format(len(self._lattice)))
-
-        # clone the root case per lattice point
-        for i in range(len(self._lattice)):
-            
-            values = self._lattice[i]
+        print('\n\n =============== CREATING {} CLONES ===============\n'.format(self._lattice_T))
+
+        # set clone directory suffixes
+        if clone_sfx is None:
+            # build columns of values which replace commas in parameter groups with underscores
+            # and remove '+' in scientific notation for numbers >= 1e5 (for safer directory, 
+            # file naming), dispatching on the dtype of each column, and join them per-lattice 
+            # point
+            format_str = lambda col: np.char.replace(col.astype(str), ',', '_')
+            # values >= 1e5 are written in scientific notation, keeping as many digits as needed 
+            # to uniquely identify each value; integers are formatted from their exact values
+            sci_float = lambda x: np.format_float_scientific(x, unique=True, 
+                                                             trim='-').replace('+', '')
+            def sci_int(x):
+                digits = str(int(x))
+                mantissa = digits[1:].rstrip('0')
+                return '{}{}e{:02d}'.format(digits[0], '.' + mantissa if mantissa else '', 
+                                            len(digits) - 1)
+            def format_num(col, format_big):
+                out = col.astype(str)
+                big = col >= 1e5
+                if(not big.any()): 
+                    return out
+                out_big = np.array([format_big(x) for x in col[big]], dtype=str)
+                out = out.astype(np.result_type(out, out_big))
+                out[big] = out_big
+                return out
+            col_formatters = {'U': format_str, 'S': format_str, 
+                              'i': lambda col: format_num(col, sci_int), 
+                              'u': lambda col: format_num(col, sci_int), 
+                              'f': lambda col: format_num(col, sci_float)}
+            str_cols = []
+            for name in params:
+                col = self._lattice[name]
+                str_cols.append(col_formatters.get(col.dtype.kind, lambda c: c.astype(str))(col))
+            sfxs = np.char.add('{}_'.format(print_params[0]), str_cols[0])
+            for j in range(1, len(params)):
+                sfxs = np.char.add(sfxs, np.char.add('__{}_'.format(print_params[j]), str_cols[j]))
+        else: 
+            clone_sfx = np.atleast_1d(clone_sfx)
+            if(len(clone_sfx) != 1 and len(clone_sfx) != self._lattice_T):
+                raise RuntimeError('clone_sfx must be a single string, or length of'\
+                                   'clone_sfx must match number of lattice points')
+            if(len(clone_sfx) > 1):
+                sfxs = clone_sfx
+            else:
+                sfxs = [clone_sfx[0]] * self._lattice_T
+
+        # message announcing each clone, with the parameter names formatted once, and a field 
+        # per parameter to be formatted with the values at each lattice point
+        params_str = np.array2string(print_params, separator=', ')
+        clone_msg_prefix = '\n --------------- creating clone with {} = ('.format(params_str)
+        values_fmt = ', '.join(['\'{}\'' if self._lattice[name].dtype.kind in ('U', 'S') else '{}' 
+                                for name in params]) + ') ---------------\n'
+
+        # collect the location and values of each clone to be created, handling any that
+        # already exist
+        new_cases, new_values = [], []
+        for i in range(self._lattice_T):
             
-            # build list of values which replaces commas in parameter groups with underscores
-            # and removes '+' in scientific notaiton for numbers >= 1e5
-            # (for safer directory, file naming)
-            print_values = list(values)
-            for j in range(len(print_values)):
-                if isinstance(print_values[j], str):
-                    print_values[j] = print_values[j].replace(',', '_') 
-                elif isinstance(print_values[j], int) or isinstance(print_values[j], int):
-                    if(print_values[j] >= 1e5):
-                        print_values[j] = '%e' % print_values[j]
-                        print_values[j] = print_values[j].replace('+', '')
- 
-            # set clone directory suffix
-            if clone_sfx is None:
-                sfx = '__'.join(['{}_{}'.format(print_params[j], print_values[j]) 
-                                 for j in range(len(values))])
-            else: 
-                clone_sfx = np.atleast_1d(clone_sfx)
-                if(len(clone_sfx) != 1 and len(clone_sfx) != len(self._lattice)):
-                    raise RuntimeError('clone_sfx must be a single string, or length of'\
-                                       'clone_sfx must match number of lattice points')
-                if(len(clone_sfx) > 1):
-                    sfx = clone_sfx[i]
-                else:
-                    sfx = clone_sfx[0]
+            values = self._row(i)
+            sfx = sfxs[i]
 
             new_case = '{}/{}__{}'.format(top_clone_dir, clone_prefix, sfx)
             new_case_out = '{}/{}__{}'.format(top_output_dir, clone_prefix, sfx)
@@ -419,100 +756,52 @@ class namelist_lattice:
                 self.clone_dirs.append(new_case)
                 continue
             
-            print('\n --------------- creating clone with {} = {} ---------------\n'.format(
-                   print_params, values))
+            print(clone_msg_prefix + values_fmt.format(*values))
+            
+            # check that this clone is unique, and does not already exist; if so, handle
+            case_key = os.path.normpath(new_case)
+            out_key = os.path.normpath(new_case_out) if top_output_dir is not None else None
+            if(case_key in queued_cases):
+                raise RuntimeError('clone at {} would be created more than once!'.format(new_case)) 
+            if(out_key is not None and out_key in queued_outs):
+                raise RuntimeError('output at {} would be created more than once!'.format(
+                                    new_case_out)) 
+            queued_cases.add(case_key)
+            if(out_key is not None):
+                queued_outs.add(out_key)
             
-            # check that this clone does not already exist; if so, handle
-            if(os.path.isdir(new_case) and overwrite == False):
+            case_exists = dir_exists(new_case, top_clone_dir, existing_cases)
+            out_exists = top_output_dir is not None and \
+                         dir_exists(new_case_out, top_output_dir, existing_outs)
+            if(case_exists and overwrite == False):
                 raise RuntimeError('clone at {} already exists!'.format(new_case)) 
-            if(os.path.isdir(new_case_out) and overwrite == False):
+            if(out_exists and overwrite == False):
                 raise RuntimeError('output at {} already exists!'.format(new_case_out)) 
-            if(os.path.isdir(new_case) and overwrite == True):
+            if(case_exists and overwrite == True):
                 print('overwrite option set to True; overwriting existing case at ' +
                        WARNC + '{}'.format(new_case) + ENDC)
                 shutil.rmtree(new_case)
-            if(os.path.isdir(new_case_out) and overwrite == True):
+            if(out_exists and overwrite == True):
                 print('overwrite option set to True; overwriting existing output at ' +
                       WARNC + '{}'.format(new_case_out) + ENDC)
                 shutil.rmtree(new_case_out)
 
-            # call the cloning script
-            if(top_output_dir is not None):
-                cmd = '{}/create_clone --case {} --clone {} --cime-output-root {} --keepexe'.format(
-                       cime_dir, new_case, root_case, top_output_dir)
-            else:
-                cmd = '{}/create_clone --case {} --clone {} --keepexe'.format(
-                       cime_dir, new_case, root_case)
-            # pipe output to file if specified
-            if(self.stdout is not None):
-                subprocess.run(cmd.split(' '), stdout=self.stdoutf)
-            else:
-                subprocess.run(cmd.split(' ')) 
-            self.clone_dirs.append(new_case)
-
-            # --- set clone resubmissions ---
-            print('Setting RESUBMIT={}'.format(resubmits))
-            os.chdir(new_case)
-            subprocess.run('{}/xmlchange RESUBMIT={}'.format(new_case, resubmits).split(' '), 
-                           stdout=self.stdoutf)
-            
-            # --- edit the user_nl_{component} file ---
-            
-            # purge current occurences of the parameters present in the lattice
-            with open('{}/user_nl_{}'.format(new_case, self.component), 'r+') as f: 
-                entries = f.readlines()
-                f.seek(0)
-                for e in entries:
-                    param = ''.join(e.split()).split('=')[0]
-                    if(param not in all_params): 
-                        f.write(e)
-                f.truncate()
-                nl = f.read()
-            
-            # write new parameter choices
-            with open('{}/user_nl_{}'.format(new_case, self.component), 'a') as f:
-                if not nl.endswith('\n'):
-                    f.write('\n')
-                f.write('! Following entries written by CESM_namelist_automator\n')
-                
-                for j in range(len(params)):
-                    
-                    # ---------- IS PARAMETER GROUP
-                    if(self.paramgroup_mask[j] == 1):
-                        group_params = params[j].split(',')
-                        group_values = values[j].split(',')
-                        
-                        if(self.xml_mask[j] == 1):
-                            # write all parameter choices in this group to env_run.xml via xmlchange
-                            os.chdir(new_case)
-                            for k in range(len(group_params)):
-                                xmlcmd = '{}/xmlchange {}={}'.format(
-                                         new_case, group_params[k], group_values[k])
-                                # pipe output to file if specified
-                                if(self.stdout is not None):
-                                    subprocess.run(xmlcmd.split(' '), stdout=self.stdoutf)
-                                else:
-                                    subprocess.run(cmd.split(' '))
-                        else:
-                            # write all parameter choices in this group to user_nl_{self.component}
-                            for k in range(len(group_params)):
-                                f.write('{} = {}\n'.format(group_params[k], group_values[k]))
-                    
-                    # ---------- IS SINGLE PARAMETER
-                    else: 
-                        if(self.xml_mask[j] == 1):
-                            # write parameter choice to env_run.xml via xmlchange
-                            os.chdir(new_case)
-                            xmlcmd = '{}/xmlchange {}={}'.format(new_case, params[j], values[j])
-                            # pipe output to file if specified
-                            if(self.stdout is not None):
-                                subprocess.run(xmlcmd.split(' '), stdout=self.stdoutf)
-                            else:
-                                subprocess.run(xmlcmd.split(' '))                    
-                        
-                        else:
-                            # write parameter choice to user_nl_{self.component}
-                            f.write('{} = {}\n'.format(params[j], values[j]))
+            new_cases.append(new_case)
+            new_values.append(values)
+        
+        # create the clones concurrently; each is dominated by waiting on the CIME utilities, 
+        # rather than by work done in this process, so threads suffice
+        if(len(new_cases) > 0):
+            if(n_workers is None):
+                n_workers = min(len(new_cases), os.cpu_count() or 1)
+            make_clone = partial(_make_one_clone, root_case=root_case, cime_dir=cime_dir, 
+                                 top_output_dir=top_output_dir, stdoutf=self.stdoutf, 
+                                 resubmits=resubmits, nl_file=nl_file, params=params, 
+                                 nl_single_js=nl_single_js, xml_single_js=xml_single_js, 
+                                 nl_group_js=nl_group_js, xml_group_js=xml_group_js, 
+                                 all_params=all_params)
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                self.clone_dirs.extend(executor.map(make_clone, new_cases, new_values))
 
 
     # ------------------------------------------------------------------------------
@@ -534,7 +823,6 @@ class namelist_lattice:
             
         for clone in self.clone_dirs:
             
-            os.chdir(clone)
             submit = '{}/case.submit'.format(clone)
             
             print('\n\n=============== submitting job from {} ===============\n'.format(submit))
@@ -543,15 +831,15 @@ class namelist_lattice:
             else:
                 # pipe output to file if specified
                 if(self.stdout is not None):
-                    subprocess.run(submit, stdout=self.stdoutf)
+                    subprocess.run(submit, stdout=self.stdoutf, cwd=clone)
                 else:
-                    subprocess.run(submit)
+                    subprocess.run(submit, cwd=clone)
     
 
     # ------------------------------------------------------------------------------
 
 
-    def resubmit_hung_clone_runs(self, dry=False):
+    def resubmit_hung_clone_runs(self, dry=False, n_workers=16):
         '''
         Resubmit runs of any cloned cases created by self.create_clones() for which
         './xmlquery RESUBMIT' does not currently return 0. This is meant to be used in 
@@ -576,20 +864,23 @@ class namelist_lattice:
         dry : boolean
             Whether or not to do a dry run, which just prints the location of each
             resubmission script which is about to be called. Defaults to False.
+        n_workers : int, optional
+            Number of threads with which to query and resubmit clones concurrently. 
+            Defaults to 16.
         '''
         
         if(len(self.clone_dirs) == 0):
             raise RuntimeError('Clone cases must first be created by calling expand()')
         
-        for clone in self.clone_dirs:
-            
-            os.chdir(clone)
-            resub_query = ['{}/xmlquery'.format(clone), 'RESUBMIT']
-            resubs = subprocess.check_output(resub_query)
-            resubs = int(resubs.split()[-1])
+        # query the remaining resubmissions of all clones concurrently
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            resubs = list(executor.map(_query_resubmits, self.clone_dirs))
+        
+        hung_clones = []
+        for clone, n_resubs in resubs:
             
             # If RESUBMIT is zero, then there is nothing to do
-            if(resubs == 0):
+            if(n_resubs == 0):
                 print('\n=== no resubmission needed for {} ===\n'.format(clone))
                 continue
 
@@ -597,14 +888,16 @@ class namelist_lattice:
             submit = '{}/case.submit'.format(clone)
             
             print('\n\n=============== resubmitting job from {} with RESUBMIT={} ===============\n'.format(
-                                                                                            submit, resubs))
+                                                                                            submit, n_resubs))
             if(dry):
                 print('DRY: {}'.format(submit))
             else:
-                if(self.stdout is not None):
-                    subprocess.run(submit, stdout=self.stdoutf)
-                else:
-                    subprocess.run(submit)
+                hung_clones.append(clone)
+        
+        # submit all hung clones concurrently, piping output to file if specified
+        if(len(hung_clones) > 0):
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                list(executor.map(partial(_submit_case, stdoutf=self.stdoutf), hung_clones))
 
 
     # ------------------------------------------------------------------------------